@@ -1,8 +1,20 @@
+import os
 import setuptools
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+# The native extension is optional, shis.utils falls back to pure Python.
+ext_modules = []
+if cythonize is not None and os.name == 'posix':
+    ext_modules = cythonize([setuptools.Extension(
+        'shis._shisfast', ['shis/_shisfast.pyx'], optional=True)])
+
 setuptools.setup(
     name="shis",
     author="Nikhil Verma",
@@ -13,8 +25,10 @@ setuptools.setup(
     url="https://github.com/nikhilweee/shis/",
     packages=setuptools.find_packages(),
     package_data={'shis': ['templates/*', 'templates/*/*']},
+    ext_modules=ext_modules,
     license="MIT",
     install_requires=['Pillow>=7.0.0', 'Jinja2', 'tqdm', 'imagesize'],
+    extras_require={'async': ['aiohttp']},
     setup_requires=['setuptools-git-versioning'],
     version_config=True,
     python_requires='>=3.6',
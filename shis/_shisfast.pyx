@@ -0,0 +1,148 @@
+# cython: language_level=3
+# Optional native helpers for shis.utils, which falls back to pure Python
+# implementations if this module has not been compiled.
+
+from libc.errno cimport ENAMETOOLONG
+from posix.stat cimport struct_stat, stat, lstat, S_ISDIR, S_ISLNK
+
+
+cdef extern from "dirent.h" nogil:
+    ctypedef struct DIR
+    struct dirent:
+        unsigned char d_type
+        char d_name[1]
+    DIR *opendir(const char *name)
+    dirent *readdir(DIR *dirp)
+    int closedir(DIR *dirp)
+    enum: DT_UNKNOWN
+    enum: DT_DIR
+    enum: DT_LNK
+
+
+cdef extern from "string.h" nogil:
+    char *strrchr(const char *s, int c)
+    size_t strlen(const char *s)
+    void *memcpy(void *dest, const void *src, size_t n)
+
+
+cdef extern from "strings.h" nogil:
+    int strcasecmp(const char *s1, const char *s2)
+
+
+cdef extern from "limits.h":
+    enum: PATH_MAX
+
+
+cdef const char *IMAGE_EXTS[5]
+IMAGE_EXTS[:] = [b'.jpeg', b'.jpg', b'.png', b'.tiff', b'.webp']
+
+cdef enum:
+    ENTRY_END
+    ENTRY_DIR
+    ENTRY_IMAGE
+    ENTRY_TOO_LONG
+
+
+cdef bint is_image(const char *name) nogil:
+    cdef const char *dot = strrchr(name, ord('.'))
+    cdef const char *c = name
+    cdef int i
+    if dot == NULL:
+        return False
+    # Like os.path.splitext, leading dots do not start an extension.
+    while c[0] == b'.' and c != dot:
+        c += 1
+    if c == dot:
+        return False
+    for i in range(5):
+        if strcasecmp(dot, IMAGE_EXTS[i]) == 0:
+            return True
+    return False
+
+
+cdef int next_entry(DIR *dirp, char *path, size_t prefix_len) nogil:
+    """Read entries until a directory or an image is found.
+
+    The full path of the entry is written to :attr:`path`, after the
+    :attr:`prefix_len` bytes of the directory path.
+    """
+    cdef dirent *entry
+    cdef struct_stat st
+    cdef const char *name
+    cdef size_t name_len
+    cdef bint is_dir, is_link
+    while True:
+        entry = readdir(dirp)
+        if entry == NULL:
+            return ENTRY_END
+        name = entry.d_name
+        if name[0] == b'.' and (name[1] == 0 or (name[1] == b'.' and name[2] == 0)):
+            continue
+        is_dir = entry.d_type == DT_DIR
+        is_link = entry.d_type == DT_LNK
+        if not (is_dir or is_link or entry.d_type == DT_UNKNOWN
+                or is_image(name)):
+            continue
+        name_len = strlen(name)
+        if prefix_len + name_len >= PATH_MAX:
+            return ENTRY_TOO_LONG
+        memcpy(path + prefix_len, name, name_len + 1)
+        if entry.d_type == DT_UNKNOWN and lstat(path, &st) == 0:
+            is_dir = S_ISDIR(st.st_mode)
+            is_link = S_ISLNK(st.st_mode)
+        if is_link:
+            # symlinks to directories are neither files nor followed
+            if stat(path, &st) == 0 and S_ISDIR(st.st_mode):
+                continue
+        elif is_dir:
+            return ENTRY_DIR
+        if is_image(name):
+            return ENTRY_IMAGE
+
+
+def find_first_image(bytes path):
+    """Find the first image in :attr:`path` and its subdirectories.
+
+    Directories are traversed in the same order as ``shis.utils._scan_files``:
+    files in a directory are checked before descending into its
+    subdirectories, and symlinked directories are not followed. Directories
+    are read without holding the GIL, so multiple threads can scan
+    directories in parallel.
+
+    :param path: the directory to scan.
+    :return: the path of the first image found, or ``None``.
+    :raises OSError: if a path does not fit in ``PATH_MAX`` bytes.
+    """
+    cdef char buf[PATH_MAX]
+    cdef DIR *dirp
+    cdef int kind
+    cdef size_t prefix_len
+    prefix = path if path.endswith(b'/') else path + b'/'
+    prefix_len = len(prefix)
+    if prefix_len >= PATH_MAX:
+        raise OSError(ENAMETOOLONG, 'File name too long', path)
+    memcpy(buf, <const char *>prefix, prefix_len + 1)
+    with nogil:
+        dirp = opendir(buf)
+    if dirp == NULL:
+        return None
+    subdirs = []
+    try:
+        while True:
+            with nogil:
+                kind = next_entry(dirp, buf, prefix_len)
+            if kind == ENTRY_END:
+                break
+            if kind == ENTRY_TOO_LONG:
+                raise OSError(ENAMETOOLONG, 'File name too long', path)
+            child = buf[:prefix_len + strlen(buf + prefix_len)]
+            if kind == ENTRY_IMAGE:
+                return child
+            subdirs.append(child)
+    finally:
+        closedir(dirp)
+    for subdir in subdirs:
+        image = find_first_image(subdir)
+        if image is not None:
+            return image
+    return None
@@ -0,0 +1,76 @@
+import os
+import asyncio
+from threading import Event
+from typing import Tuple
+
+from aiohttp import web
+
+
+class AsyncHTTPServer:
+    """An :mod:`aiohttp` based server to serve arbitrary directories.
+
+    The server binds to :attr:`server_address` on creation and runs an
+    :mod:`asyncio` event loop in :meth:`serve_forever`, so it can be used
+    as a drop in replacement for the threaded servers in :mod:`shis.utils`.
+    Files are sent using :class:`aiohttp.web.FileResponse`, which uses
+    ``sendfile`` where available.
+
+    :param server_address: the address to start the server on.
+    :param RequestHandlerClass: unused, accepted for compatibility with
+        :class:`http.server.HTTPServer`.
+    :param directory: the directory to serve.
+
+    :meta private:
+    """
+
+    def __init__(self, server_address: Tuple[str, int],
+                 RequestHandlerClass: type=None, directory: str=os.getcwd()):
+        self.directory = directory
+        self._stopped = Event()
+        self.loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, *server_address)
+        try:
+            self.loop.run_until_complete(site.start())
+        except OSError:
+            self.loop.run_until_complete(self.runner.cleanup())
+            self.loop.close()
+            raise
+        self.server_address = self.runner.addresses[0]
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve a file from :attr:`directory`."""
+        path = os.path.join(self.directory, request.match_info['path'])
+        path = os.path.normpath(path)
+        if os.path.commonpath([path, self.directory]) != self.directory:
+            raise web.HTTPNotFound()
+        if os.path.isdir(path):
+            if not request.path.endswith('/'):
+                location = request.rel_url.raw_path + '/'
+                if request.query_string:
+                    location += '?' + request.rel_url.raw_query_string
+                raise web.HTTPMovedPermanently(location)
+            path = os.path.join(path, 'index.html')
+        elif request.path.endswith('/'):
+            raise web.HTTPNotFound()
+        if not os.path.isfile(path):
+            raise web.HTTPNotFound()
+        return web.FileResponse(path)
+
+    def serve_forever(self) -> None:
+        """Run the event loop until :meth:`shutdown` is called."""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+            self.loop.run_until_complete(self.runner.cleanup())
+        finally:
+            self.loop.close()
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever` and wait until it has stopped."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._stopped.wait()
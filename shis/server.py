@@ -15,8 +15,8 @@ from PIL import Image, ImageOps
 from tqdm.contrib.concurrent import process_map
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-from shis.utils import (chunks, filter_image, find_thumb, rreplace, urlify,
-                        start_server, scale_dims, fixed_width_formatter)
+from shis.utils import (chunks, filter_image, find_thumbs_bulk, rreplace,
+                        urlify, start_server, scale_dims, fixed_width_formatter)
 
 
 def generate_thumbnail(paths: Tuple[str, str, str, str], args: argparse.Namespace):
@@ -176,14 +176,18 @@ def generate_albums(args: argparse.Namespace) -> Tuple[Dict, int]:
             random.shuffle(folders)
 
         # Albums
-        albums = []
+        album_roots = {}
         for folder_name in folders:
             album_path = os.path.join(index_root, folder_name)
             if args.thumb_dir in album_path:
                 continue
-            album_size = len(os.listdir(album_path))
             image_root = os.path.join(small_root, folder_name)
-            image = find_thumb(album_path, image_root, args.thumb_dir)
+            album_roots[folder_name] = (album_path, image_root)
+        images = find_thumbs_bulk(album_roots.values(), args.thumb_dir)
+        albums = []
+        for folder_name, (album_path, _) in album_roots.items():
+            album_size = len(os.listdir(album_path))
+            image = images[album_path]
 
             album_slug_path = os.path.join(slug_path, folder_name)
             url = urlify(album_slug_path)
@@ -387,6 +391,8 @@ def make_parser() -> argparse.ArgumentParser:
         help='size of generated thumbnails in pixels (default: %(default)s)')
     parser.add_argument('--preview-size', type=int, default=1024, metavar='SIZE',
         help='size of generated previews in pixels (default: %(default)s)')
+    parser.add_argument('--async', action='store_true', dest='async_server',
+        help='serve the website using aiohttp (requires aiohttp)')
     return parser
 
 
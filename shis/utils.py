@@ -1,29 +1,53 @@
 import os
 import sys
+import errno
+import stat
+import time
+import queue
+import socket
+import selectors
 import argparse
+import posixpath
+import contextlib
+import urllib.parse
 import urllib.request
-from functools import partial
+from functools import lru_cache, partial
+from http import HTTPStatus
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from threading import Thread
-from typing import Generator, List, Tuple
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
 
 from tqdm import tqdm
 
+try:
+    from shis._shisfast import find_first_image as _find_first_image
+except ImportError:
+    _find_first_image = None
+
 
 #-------------------------------------------------------------------------------
 # General Utils
 #-------------------------------------------------------------------------------
 
 
-def chunks(iterable: List[str], chunk_size: int) -> Generator[List[str], None, None] :
+def chunks(iterable: Iterable[str], chunk_size: int) -> Generator[List[str], None, None] :
     """Yield successive :attr:`chunk_size` sized chunks from :attr:`iterable`.
 
+    :attr:`iterable` is consumed lazily, so generators can be chunked
+    without materializing them first.
+
     :param iterable: an iterable to split into chunks.
     :param chunk_size: number of chunks to split :attr:`iterable` into.
     :return: a generator comtaining chunks of :attr:`iterable`.
     """
-    for i in range(0, len(iterable), chunk_size):
-        yield iterable[i:i + chunk_size]
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
 
 
 def rreplace(string: str, find: str, replace: str) -> str:
@@ -52,16 +76,77 @@ def urlify(slug: str, page=1) -> str:
     return url
 
 
+_IMAGE_EXTS = frozenset({'.jpeg', '.jpg', '.png', '.tiff', '.webp'})
+
+
 def filter_image(name: str) -> bool:
     """Checks if a given file name is an image.
 
     :param name: the file name to check.
     :return: ``True`` if the file name is an image, ``False`` otherwise.
     """
-    _, ext = os.path.splitext(name)
-    if ext.lower() in ['.jpeg', '.jpg', '.png', '.tiff', '.webp']:
-        return True
-    return False
+    dot = name.rfind('.')
+    if dot <= 0 or name[dot:].lower() not in _IMAGE_EXTS:
+        return False
+    # Like os.path.splitext, leading dots do not start an extension.
+    return name[:dot].lstrip('.') != ''
+
+
+def filter_image_entry(entry: os.DirEntry) -> bool:
+    """Checks if a given :class:`os.DirEntry` is an image.
+
+    :param entry: the directory entry to check.
+    :return: ``True`` if the entry is an image, ``False`` otherwise.
+    """
+    return filter_image(entry.name)
+
+
+def _scan_files(path: str) -> Generator[os.DirEntry, None, None]:
+    """Recursively yield file entries in :attr:`path` using :func:`os.scandir`.
+
+    Like :func:`os.walk`, files in a directory are yielded before descending
+    into its subdirectories, symlinked directories are not followed and
+    unreadable directories are skipped.
+
+    :param path: the directory to scan.
+    :return: a generator yielding :class:`os.DirEntry` objects for files.
+    """
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _scan_files(subdir)
+
+
+def _find_first_image_path(album_path: str) -> Optional[str]:
+    """Finds the path of the first image in :attr:`album_path`, if any.
+
+    The native :mod:`shis._shisfast` implementation is used if available,
+    falling back to :func:`_scan_files` if it is not or if it fails.
+
+    :param album_path: the directory to scan.
+    :return: the path of the first image, or ``None``.
+    """
+    if _find_first_image is not None:
+        try:
+            file_path = _find_first_image(os.fsencode(album_path))
+            return file_path and os.fsdecode(file_path)
+        except OSError:
+            # e.g. paths longer than PATH_MAX, which os.scandir can handle
+            pass
+    return next((entry.path for entry in _scan_files(album_path)
+                 if filter_image_entry(entry)), None)
 
 
 def find_thumb(album_path: str, image_root: str, thumb_dir: str) -> str:
@@ -73,38 +158,53 @@ def find_thumb(album_path: str, image_root: str, thumb_dir: str) -> str:
     :return: relative path to an image in :attr:`album_path` if it
         exists, empty string otherwise.
     """
-    image = ''
-    for root, _, files in os.walk(album_path):
-        for name in files:
-            file_path = os.path.join(root, name)
-            if filter_image(file_path):
-                rel_path = os.path.relpath(file_path, album_path)
-                image_path = os.path.join(image_root, rel_path)
-                image = os.path.relpath(image_path, thumb_dir)
-                return image
-    return image
+    file_path = _find_first_image_path(album_path)
+    if not file_path:
+        return ''
+    # file_path is always found by scanning album_path, so it is a prefix.
+    rel_path = file_path[len(album_path):].lstrip(os.sep)
+    image_path = os.path.join(image_root, rel_path)
+    return os.path.relpath(image_path, thumb_dir)
+
+def find_thumbs_bulk(albums: Iterable[Tuple[str, str]],
+                     thumb_dir: str) -> Dict[str, str]:
+    """Finds the first available image in multiple directories in parallel.
+
+    Scanning directories is I/O bound, so :func:`find_thumb` is called for
+    each album using a pool of threads.
+
+    :param albums: an iterable of ``(album_path, image_root)`` tuples, as
+        accepted by :func:`find_thumb`.
+    :param thumb_dir: the path to the generated website.
+    :return: a dictionary mapping each ``album_path`` to the result of
+        :func:`find_thumb`.
+    """
+    albums = list(albums)
+    if len(albums) <= 1:
+        return {album_path: find_thumb(album_path, image_root, thumb_dir)
+                for album_path, image_root in albums}
+    with ThreadPoolExecutor(max_workers=min(32, len(albums))) as executor:
+        futures = {album_path: executor.submit(find_thumb, album_path,
+                                               image_root, thumb_dir)
+                   for album_path, image_root in albums}
+        return {album_path: future.result()
+                for album_path, future in futures.items()}
+
 
 def scale_dims(width: int, height: int, min_val: int) -> Tuple[int, int]:
     """Scales :attr:`width` and :attr:`height` according to :attr:`min_val`.
 
-    The smaller out of :attr:`width` and :attr:`height` is assigned a value of
-    :attr:`min_val`, and the other parameter is scaled accordingly.
+    :attr:`height` is assigned a value of :attr:`min_val`, and
+    :attr:`width` is scaled accordingly to preserve the aspect ratio.
 
     :param width: the width to scale
     :param height: the height to scale
-    :param min_val: the minimum value of width or height
+    :param min_val: the value to scale the height to
     :return: a tuple containing the scaled width and height
     """
-    if width < height:
-        width = width * min_val / height
-        height = min_val
-    if width == height:
-        width = min_val
-        height = min_val
-    if width > height:
-        width = width * min_val / height
-        height = min_val
-    return round(width), round(height)
+    if not height:
+        return min_val, min_val
+    return round(width * min_val / height), min_val
 
 
 #-------------------------------------------------------------------------------
@@ -112,11 +212,11 @@ def scale_dims(width: int, height: int, min_val: int) -> Tuple[int, int]:
 #-------------------------------------------------------------------------------
 
 
-def fixed_width_formatter(width: int=80) -> argparse.HelpFormatter:
-    """Patch :class:`argparse.HelpFormatter` to use a fixed width.
+@lru_cache(maxsize=16)
+def _fixed_width_formatter(width: int) -> argparse.HelpFormatter:
+    """Create a :class:`argparse.HelpFormatter` subclass with a fixed width.
 
-    :param width: the maximum width of the help and usage text generated.
-    :return: a patched instance of the formatter class.
+    :meta private:
     """
 
     class HelpFormatter(argparse.HelpFormatter):
@@ -127,11 +227,53 @@ def fixed_width_formatter(width: int=80) -> argparse.HelpFormatter:
     return HelpFormatter
 
 
+def fixed_width_formatter(width: int=80) -> argparse.HelpFormatter:
+    """Patch :class:`argparse.HelpFormatter` to use a fixed width.
+
+    The patched class is cached, so the same class is returned for a
+    given :attr:`width`, however it is passed.
+
+    :param width: the maximum width of the help and usage text generated.
+    :return: a patched instance of the formatter class.
+    """
+    return _fixed_width_formatter(width)
+
+
 #-------------------------------------------------------------------------------
 # Server Utils
 #-------------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=2048)
+def _translate_path(path: str, directory: str) -> str:
+    """Translate a /-separated :attr:`path` relative to :attr:`directory`.
+
+    This mirrors :meth:`http.server.SimpleHTTPRequestHandler.translate_path`
+    and is cached, since the same paths are requested over and over again.
+    Query parameters and fragments should already be stripped from
+    :attr:`path`.
+
+    :meta private:
+    """
+    # Don't forget explicit trailing slash when normalizing. Issue17324
+    trailing_slash = path.rstrip().endswith('/')
+    try:
+        path = urllib.parse.unquote(path, errors='surrogatepass')
+    except UnicodeDecodeError:
+        path = urllib.parse.unquote(path)
+    path = posixpath.normpath(path)
+    words = filter(None, path.split('/'))
+    path = directory
+    for word in words:
+        if os.path.dirname(word) or word in (os.curdir, os.pardir):
+            # Ignore components that are not a simple file/directory name
+            continue
+        path = os.path.join(path, word)
+    if trailing_slash:
+        path += '/'
+    return path
+
+
 class CustomHTTPHandler(SimpleHTTPRequestHandler):
     """An HTTP Handler to serve arbitrary directories compatible with Python 3.6.
 
@@ -142,28 +284,278 @@ class CustomHTTPHandler(SimpleHTTPRequestHandler):
     """
 
     protocol_version = "HTTP/1.1"
+    # give up on clients that stall in the middle of a request
+    timeout = 60
+    # buffer reads, but write headers straight through before sendfile
+    rbufsize = -1
+    wbufsize = 0
+    _keep_alive = False
+    _etag = None
+
+    def setup(self) -> None:
+        """Set up the connection for small responses over keep-alive."""
+        SimpleHTTPRequestHandler.setup(self)
+        with contextlib.suppress(OSError):
+            # disable Nagle's algorithm for small responses
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.request.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
 
     def translate_path(self, path: str) -> str:
         """Translates a path to the local filename syntax."""
-        path = SimpleHTTPRequestHandler.translate_path(self, path)
-        if hasattr(self.server, 'directory'):
-            relpath = os.path.relpath(path, os.getcwd())
-            path = os.path.join(self.server.directory, relpath)
-        return path
+        # abandon query parameters
+        path = path.split('?', 1)[0].split('#', 1)[0]
+        directory = (getattr(self.server, 'directory', None)
+                     or getattr(self, 'directory', None) or os.getcwd())
+        return _translate_path(path, directory)
     
+    def send_head(self):
+        """Common code for GET and HEAD commands.
+
+        Redirects for directories without a trailing slash are sent with a
+        ``Content-Length`` so that the connection can be kept alive. Files
+        are sent with an ``ETag``, and a matching ``If-None-Match`` header
+        results in a ``304 Not Modified`` response without a body.
+        """
+        self._etag = None
+        path = self.translate_path(self.path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return SimpleHTTPRequestHandler.send_head(self)
+        if stat.S_ISDIR(st.st_mode):
+            parts = urllib.parse.urlsplit(self.path)
+            if not parts.path.endswith('/'):
+                new_parts = (parts[0], parts[1], parts[2] + '/',
+                             parts[3], parts[4])
+                self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+                self.send_header('Location', urllib.parse.urlunsplit(new_parts))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+        elif not self.path.split('?', 1)[0].split('#', 1)[0].endswith('/'):
+            # a file requested with a trailing slash is a 404 in send_head
+            self._etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match:
+                tags = [tag.strip() for tag in if_none_match.split(',')]
+                if '*' in tags or self._etag in tags or f'W/{self._etag}' in tags:
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.end_headers()
+                    return None
+        return SimpleHTTPRequestHandler.send_head(self)
+
+    def end_headers(self) -> None:
+        """Send the ``ETag`` for the current file, if any, and end headers."""
+        if self._etag is not None:
+            self.send_header('ETag', self._etag)
+            # Always revalidate, since the website changes in watch mode.
+            self.send_header('Cache-Control', 'no-cache')
+            self._etag = None
+        SimpleHTTPRequestHandler.end_headers(self)
+
+    def send_error(self, code: int, message: str=None, explain: str=None) -> None:
+        """Send an error reply, keeping the connection alive on a 404.
+
+        Missing thumbnails are common while they are still being generated,
+        so a 404 should not force the browser to open a new connection.
+        This is only safe if the request has no body left unread.
+        """
+        self._etag = None
+        self._keep_alive = (code == HTTPStatus.NOT_FOUND
+                            and not self.close_connection
+                            and not self._has_body())
+        try:
+            SimpleHTTPRequestHandler.send_error(self, code, message, explain)
+        finally:
+            self._keep_alive = False
+
+    def _has_body(self) -> bool:
+        """Check if the current request was sent with a body."""
+        headers = getattr(self, 'headers', None)
+        if headers is None:
+            return True
+        if 'Transfer-Encoding' in headers:
+            return True
+        return headers.get('Content-Length', '0').strip() != '0'
+
+    def send_header(self, keyword: str, value: str) -> None:
+        """Send a MIME header, dropping ``Connection: close`` if required."""
+        if self._keep_alive and keyword.lower() == 'connection':
+            return
+        SimpleHTTPRequestHandler.send_header(self, keyword, value)
+
+    def copyfile(self, source, outputfile) -> None:
+        """Copy all data from :attr:`source` to :attr:`outputfile`.
+
+        Data sent to the client uses :meth:`socket.socket.sendfile`, which
+        copies within the kernel where ``os.sendfile`` is available, and
+        falls back to regular sends otherwise.
+        """
+        if outputfile is not self.wfile:
+            return SimpleHTTPRequestHandler.copyfile(self, source, outputfile)
+        self.wfile.flush()
+        self.connection.sendfile(source)
+
     def log_message(self, format: str, *args: str) -> None:
         """A dummy function overridden to disable logging."""
         pass
     
     def handle(self) -> None:
-        """Handle multiple requests if necessary."""
+        """Handle multiple requests if necessary.
+
+        If the server parks idle connections (see :class:`ThreadPoolMixIn`),
+        the handler returns with :attr:`close_connection` unset once no
+        further request is pending, so that the server can wait for the
+        next request without holding on to a worker.
+        """
+        parks_idle = getattr(self.server, 'parks_idle_connections', False)
         self.close_connection = True
         try:
             self.handle_one_request()
             while not self.close_connection:
+                if parks_idle and not self._request_pending():
+                    return
                 self.handle_one_request()
         except (ConnectionResetError, BrokenPipeError):
-            pass
+            self.close_connection = True
+
+    def _request_pending(self) -> bool:
+        """Check, without blocking, if another request has been received."""
+        timeout = self.connection.gettimeout()
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        finally:
+            self.connection.settimeout(timeout)
+
+
+class ThreadPoolMixIn:
+    """Mix-in class to handle requests using a fixed pool of worker threads.
+
+    Unlike :class:`socketserver.ThreadingMixIn`, threads are reused across
+    connections instead of spawning a new thread for every connection.
+    Idle keep-alive connections are watched by a single selector thread and
+    only handed to a worker once a request arrives, so they never hold on
+    to a worker. Connections idle for :attr:`idle_timeout` seconds are
+    closed. All threads are daemon threads so that they do not prevent the
+    process from exiting, and are stopped by :meth:`server_close`.
+
+    :meta private:
+    """
+
+    max_workers = 64
+    idle_timeout = 60
+    parks_idle_connections = True
+    _requests = None
+    _stopping = False
+
+    def process_request(self, request, client_address):
+        """Wait for a request on the connection in the selector thread."""
+        if self._requests is None:
+            self._requests = queue.Queue()
+            self._idle = queue.Queue()
+            self._wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._threads = [Thread(target=self.select_requests_thread,
+                                    daemon=True)]
+            for _ in range(self.max_workers):
+                self._threads.append(Thread(
+                    target=self.process_request_thread, daemon=True))
+            for thread in self._threads:
+                thread.start()
+        self._idle.put((request, client_address))
+        self._wakeup_send.send(b'\0')
+
+    def select_requests_thread(self):
+        """Queue idle connections for the workers once they are readable."""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            while not self._stopping:
+                for key, _ in selector.select(timeout=1):
+                    if key.fileobj is self._wakeup_recv:
+                        self._wakeup_recv.recv(4096)
+                        while not self._idle.empty():
+                            request, client_address = self._idle.get()
+                            deadline = time.monotonic() + self.idle_timeout
+                            selector.register(request, selectors.EVENT_READ,
+                                              (client_address, deadline))
+                    else:
+                        selector.unregister(key.fileobj)
+                        self._requests.put((key.fileobj, key.data[0]))
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    if key.data is not None and (self._stopping
+                                                 or key.data[1] < now):
+                        selector.unregister(key.fileobj)
+                        self.shutdown_request(key.fileobj)
+
+    def process_request_thread(self):
+        """Handle queued requests until :meth:`server_close` is called."""
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                handler = self.RequestHandlerClass(request, client_address, self)
+                idle = not getattr(handler, 'close_connection', True)
+            except Exception:
+                self.handle_error(request, client_address)
+                idle = False
+            if idle and not self._stopping:
+                self.process_request(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        """Stop all threads and close every idle connection."""
+        super().server_close()
+        if self._requests is None or self._stopping:
+            return
+        self._stopping = True
+        self._wakeup_send.send(b'\0')
+        for _ in range(self.max_workers):
+            self._requests.put(None)
+        for thread in self._threads:
+            thread.join()
+        while not self._idle.empty():
+            request, _ = self._idle.get()
+            self.shutdown_request(request)
+        while not self._requests.empty():
+            item = self._requests.get()
+            if item is not None:
+                self.shutdown_request(item[0])
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+
+_REDIRECT_HTML = (b'<html><head><meta http-equiv="Refresh" '
+                  b'content="0; URL=html/"></head></html>')
+
+
+def _ensure_redirect(thumb_dir: str) -> None:
+    """Create an ``index.html`` in :attr:`thumb_dir` redirecting to ``html/``.
+
+    The file is replaced atomically, and is left untouched if it already
+    has the right contents.
+
+    :param thumb_dir: the path to the generated website.
+    """
+    os.makedirs(thumb_dir, exist_ok=True)
+    redir_html = os.path.join(thumb_dir, 'index.html')
+    try:
+        if os.stat(redir_html).st_size == len(_REDIRECT_HTML):
+            with open(redir_html, 'rb') as f:
+                if f.read() == _REDIRECT_HTML:
+                    return
+    except OSError:
+        pass
+    tmp_html = f'{redir_html}.{os.getpid()}.tmp'
+    fd = os.open(tmp_html, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, _REDIRECT_HTML)
+    finally:
+        os.close(fd)
+    os.replace(tmp_html, redir_html)
 
 
 def start_server(args: argparse.Namespace) -> HTTPServer:
@@ -172,11 +564,9 @@ def start_server(args: argparse.Namespace) -> HTTPServer:
     :param args: preprocessed command line arguments.
     """
     # We need to create index.html for get_public_ip to receive HTTP 200.
-    os.makedirs(args.thumb_dir, exist_ok=True)
-    redir_html = os.path.join(args.thumb_dir, 'index.html')
-    with open(redir_html, 'w') as f:
-        f.write(f'<html><head><meta http-equiv="Refresh" '
-                f'content="0; URL=html/"></head></html>')
+    _ensure_redirect(args.thumb_dir)
+    if getattr(args, 'async_server', False):
+        return start_server_async(args)
     if sys.version_info.minor in [6, 7]:
         return start_server_36(args)
     if sys.version_info.minor >= 8:
@@ -211,18 +601,17 @@ def start_httpd(server: HTTPServer, address: Tuple[str, int],
     :param handler: the request handler to use with the server
     :param args: preprocessed command line arguments
     """
-    try:
-        return server(address, handler)
-    except OSError as error:
-        if str(error) == '[Errno 98] Address already in use':
-            if args.port is not None or address[1] > 7500:
-                print(f'OSError: {error}. Try a different port using the -p flag.')
-                sys.exit()
-            else:
-                address = (address[0], address[1]+1)
-                return start_httpd(server, address, handler, args)
-        else:
-            raise error
+    host, port, *rest = address
+    last_port = port if args.port is not None else max(port, 7500) + 1
+    for port in range(port, last_port + 1):
+        try:
+            return server((host, port, *rest), handler)
+        except OSError as error:
+            if error.errno != errno.EADDRINUSE:
+                raise
+            last_error = error
+    print(f'OSError: {last_error}. Try a different port using the -p flag.')
+    sys.exit()
 
 
 def start_server_36(args):
@@ -230,20 +619,23 @@ def start_server_36(args):
     
     :meta private:
     """
-    import socketserver
-
     class CustomHTTPServer(HTTPServer):
+        request_queue_size = 128
+
         def __init__(self, server_address: str, 
                      RequestHandlerClass: HTTPServer=CustomHTTPHandler,
                      directory: str=os.getcwd()):
             self.directory = directory
             HTTPServer.__init__(self, server_address, RequestHandlerClass)
 
-    class ThreadingHTTPServer(socketserver.ThreadingMixIn, CustomHTTPServer):
-        daemon_threads = False
-    
+    class PooledHTTPServer(ThreadPoolMixIn, CustomHTTPServer):
+        def __init__(self, server_address: str,
+                     RequestHandlerClass: HTTPServer=CustomHTTPHandler):
+            super().__init__(server_address, RequestHandlerClass,
+                             directory=args.thumb_dir)
+
     handler_class = CustomHTTPHandler
-    server_class = partial(ThreadingHTTPServer, directory=args.thumb_dir)
+    server_class = PooledHTTPServer
     server_address = ("", args.port or 7447)
     httpd = start_httpd(server_class, server_address, handler_class, args)
 
@@ -263,10 +655,11 @@ def start_server_38(args):
     
     :meta private:
     """    
-    import contextlib
-    from http.server import ThreadingHTTPServer, _get_best_family
+    from http.server import _get_best_family
+
+    class DualStackServer(ThreadPoolMixIn, HTTPServer):
+        request_queue_size = 128
 
-    class DualStackServer(ThreadingHTTPServer):
         def server_bind(self):
             # suppress exception when protocol is IPv4
             with contextlib.suppress(Exception):
@@ -274,7 +667,12 @@ def start_server_38(args):
                     socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
             return super().server_bind()
 
-    handler_class = partial(CustomHTTPHandler, directory=args.thumb_dir)
+    class BoundHTTPHandler(CustomHTTPHandler):
+        def __init__(self, *handler_args, **handler_kwargs):
+            super().__init__(*handler_args, directory=args.thumb_dir,
+                             **handler_kwargs)
+
+    handler_class = BoundHTTPHandler
     server_class = DualStackServer
     server_class.address_family, server_address = \
         _get_best_family(None, args.port or 7447)
@@ -288,3 +686,28 @@ def start_server_38(args):
                f"Press CTRL-C to quit.")
 
     return httpd
+
+
+def start_server_async(args):
+    """Start an asynchronous HTTP Server using :mod:`aiohttp`.
+
+    :meta private:
+    """
+    try:
+        from shis.async_server import AsyncHTTPServer
+    except ImportError as error:
+        print(f'ImportError: {error}. Install aiohttp to use --async.')
+        sys.exit()
+
+    server_class = partial(AsyncHTTPServer, directory=args.thumb_dir)
+    server_address = ("", args.port or 7447)
+    httpd = start_httpd(server_class, server_address, None, args)
+
+    Thread(target=httpd.serve_forever).start()
+
+    host, port = httpd.server_address[:2]
+    host, port = get_public_ip(host, port)
+    tqdm.write(f"Serving HTTP on {host}:{port}. "
+               f"Press CTRL-C to quit.")
+
+    return httpd
@@ -0,0 +1,78 @@
+import errno
+import os
+import socket
+import tempfile
+import unittest
+from http.client import HTTPConnection
+from threading import Thread
+
+try:
+    from shis.async_server import AsyncHTTPServer
+except ImportError:
+    AsyncHTTPServer = None
+
+
+@unittest.skipIf(AsyncHTTPServer is None, 'aiohttp is not installed')
+class AsyncHTTPServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmpdir.name, 'secret'), 'w') as f:
+            f.write('secret')
+        self.site = os.path.join(self.tmpdir.name, 'site')
+        os.makedirs(os.path.join(self.site, 'sub'))
+        with open(os.path.join(self.site, 'index.html'), 'w') as f:
+            f.write('shis')
+        with open(os.path.join(self.site, 'sub', 'index.html'), 'w') as f:
+            f.write('sub')
+        self.server = AsyncHTTPServer(('127.0.0.1', 0), directory=self.site)
+        self.port = self.server.server_address[1]
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.tmpdir.cleanup()
+
+    def get(self, path):
+        connection = HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            return response.status, response.getheader('Location'), response.read()
+        finally:
+            connection.close()
+
+    def test_index(self):
+        status, _, body = self.get('/')
+        self.assertEqual((status, body), (200, b'shis'))
+        status, _, body = self.get('/sub/')
+        self.assertEqual((status, body), (200, b'sub'))
+
+    def test_directory_redirect(self):
+        status, location, _ = self.get('/sub')
+        self.assertEqual((status, location), (301, '/sub/'))
+        status, location, _ = self.get('/sub?q=1')
+        self.assertEqual((status, location), (301, '/sub/?q=1'))
+
+    def test_not_found(self):
+        self.assertEqual(self.get('/missing.jpg')[0], 404)
+        self.assertEqual(self.get('/index.html/')[0], 404)
+
+    def test_traversal(self):
+        for path in ['/%2e%2e/secret', '/sub/%2e%2e/%2e%2e/secret',
+                     '/..%2fsecret', '//' + self.tmpdir.name.lstrip('/') + '/secret',
+                     '/' + self.tmpdir.name + '/secret']:
+            status, _, body = self.get(path)
+            self.assertNotEqual(body, b'secret', path)
+            self.assertEqual(status, 404, path)
+
+    def test_address_in_use(self):
+        with self.assertRaises(OSError) as context:
+            AsyncHTTPServer(('127.0.0.1', self.port), directory=self.site)
+        self.assertEqual(context.exception.errno, errno.EADDRINUSE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,382 @@
+import argparse
+import contextlib
+import errno
+import io
+import os
+import socket
+import tempfile
+import unittest
+from functools import partial
+from http.client import HTTPConnection
+from http.server import HTTPServer, ThreadingHTTPServer
+from threading import Thread
+
+from shis import utils
+from shis.utils import CustomHTTPHandler, ThreadPoolMixIn, _translate_path
+
+
+class PooledServer(ThreadPoolMixIn, HTTPServer):
+    max_workers = 2
+
+
+class ServerTestCase(unittest.TestCase):
+
+    server_class = PooledServer
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmpdir.name, 'index.html'), 'w') as f:
+            f.write('shis')
+        handler = partial(CustomHTTPHandler, directory=self.tmpdir.name)
+        self.server = self.server_class(('127.0.0.1', 0), handler)
+        self.port = self.server.server_address[1]
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.connections = []
+
+    def tearDown(self):
+        for connection in self.connections:
+            connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def get(self, connection):
+        connection.request('GET', '/index.html')
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def connect(self):
+        connection = HTTPConnection('127.0.0.1', self.port, timeout=5)
+        self.connections.append(connection)
+        return connection
+
+
+class ThreadPoolMixInTest(ServerTestCase):
+
+    def test_idle_connections_do_not_block_workers(self):
+        idle = [self.connect() for _ in range(self.server.max_workers * 2)]
+        for connection in idle:
+            self.assertEqual(self.get(connection), (200, b'shis'))
+        # All idle connections are kept alive, yet a new one is answered.
+        self.assertEqual(self.get(self.connect()), (200, b'shis'))
+        # Idle connections can still be reused.
+        for connection in idle:
+            self.assertEqual(self.get(connection), (200, b'shis'))
+
+    def test_server_close(self):
+        connection = self.connect()
+        self.assertEqual(self.get(connection), (200, b'shis'))
+        threads = self.server._threads
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(connection.sock.recv(1), b'')
+
+    def test_pipelined_requests(self):
+        request = b'GET /index.html HTTP/1.1\r\nHost: localhost\r\n\r\n'
+        with socket.create_connection(('127.0.0.1', self.port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(request * 2)
+            data = b''
+            while data.count(b'shis') < 2:
+                data += sock.recv(4096)
+        self.assertEqual(data.count(b'HTTP/1.1 200'), 2)
+
+
+class CustomHTTPHandlerTest(ServerTestCase):
+
+    def test_etag_not_modified(self):
+        connection = self.connect()
+        connection.request('GET', '/index.html')
+        response = connection.getresponse()
+        response.read()
+        etag = response.getheader('ETag')
+        self.assertIsNotNone(etag)
+        connection.request('GET', '/index.html',
+                           headers={'If-None-Match': etag})
+        response = connection.getresponse()
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.read(), b'')
+        self.assertEqual(response.getheader('ETag'), etag)
+        self.assertEqual(response.getheader('Cache-Control'), 'no-cache')
+
+    def test_file_with_trailing_slash(self):
+        connection = self.connect()
+        connection.request('GET', '/index.html/', headers={'If-None-Match': '*'})
+        response = connection.getresponse()
+        response.read()
+        self.assertEqual(response.status, 404)
+
+    def test_query_string_is_ignored(self):
+        connection = self.connect()
+        for query in ['?v=1', '?v=2#top']:
+            connection.request('GET', '/index.html' + query)
+            response = connection.getresponse()
+            self.assertEqual((response.status, response.read()), (200, b'shis'))
+        path = _translate_path('/index.html', self.tmpdir.name)
+        self.assertEqual(path, os.path.join(self.tmpdir.name, 'index.html'))
+        self.assertEqual(_translate_path('/a/../b/', '/srv'), '/srv/b/')
+
+    def raw_request(self, request):
+        with socket.create_connection(('127.0.0.1', self.port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(request)
+            data = b''
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    return data
+                data += chunk
+
+    def test_not_found_keeps_connection_alive(self):
+        connection = self.connect()
+        connection.request('GET', '/missing.jpg')
+        response = connection.getresponse()
+        response.read()
+        self.assertEqual(response.status, 404)
+        self.assertIsNone(response.getheader('Connection'))
+        self.assertEqual(self.get(connection), (200, b'shis'))
+
+    def test_not_found_with_body_closes_connection(self):
+        request = (b'GET /missing.jpg HTTP/1.1\r\nHost: localhost\r\n'
+                   b'Content-Length: 16\r\n\r\nGET / HTTP/1.1\r\n')
+        data = self.raw_request(request)
+        self.assertIn(b'Connection: close', data)
+        self.assertEqual(data.count(b'HTTP/1.'), 1)
+
+
+class ThreadingServerTest(ServerTestCase):
+
+    server_class = ThreadingHTTPServer
+
+    def test_keep_alive(self):
+        connection = self.connect()
+        for _ in range(3):
+            self.assertEqual(self.get(connection), (200, b'shis'))
+
+
+class FindFirstImageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def touch(self, *parts):
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+        return path
+
+    def make_tree(self):
+        self.touch('a', 'b', 'deep.jpg')
+        self.touch('a', 'notes.txt')
+        self.touch('c', 'd', 'e', 'f.PNG')
+        self.touch('c', 'readme')
+        os.symlink(os.path.join(self.root, 'a', 'b'),
+                   os.path.join(self.root, 'c', 'link.jpg'))
+        os.symlink(os.path.join(self.root, 'missing'),
+                   os.path.join(self.root, 'c', 'd', 'broken.webp'))
+        os.makedirs(os.path.join(self.root, 'empty'))
+        self.touch('hidden', '.png')
+        self.touch('hidden', '..jpg')
+        self.touch('hidden', 'sub', '.a.webp')
+
+    def scan_files(self, path):
+        return next((entry.path for entry in utils._scan_files(path)
+                     if utils.filter_image_entry(entry)), None)
+
+    @unittest.skipIf(utils._find_first_image is None,
+                     'shis._shisfast is not compiled')
+    def test_native_matches_scan_files(self):
+        self.make_tree()
+        for path in ['', 'a', 'a/b', 'c', 'c/d', 'empty', 'hidden', 'missing']:
+            path = os.path.join(self.root, path).rstrip('/')
+            native = utils._find_first_image(os.fsencode(path))
+            native = native and os.fsdecode(native)
+            self.assertEqual(native, self.scan_files(path), path)
+
+    def test_path_longer_than_path_max(self):
+        fd = os.open(self.root, os.O_RDONLY)
+        try:
+            for _ in range(20):
+                os.mkdir('d' * 200, dir_fd=fd)
+                next_fd = os.open('d' * 200, os.O_RDONLY, dir_fd=fd)
+                os.close(fd)
+                fd = next_fd
+            os.close(os.open('i' * 200 + '.jpg', os.O_CREAT | os.O_WRONLY,
+                             dir_fd=fd))
+        finally:
+            os.close(fd)
+        image = utils.find_thumb(self.root, '/site/small', '/site')
+        self.assertTrue(image.endswith('i' * 200 + '.jpg'))
+
+    def test_files_before_subdirectories(self):
+        self.touch('album', 'a', 'first.jpg')
+        self.touch('album', 'z.jpg')
+        album = os.path.join(self.root, 'album')
+        self.assertEqual(utils.find_thumb(album, '/site/small', '/site'),
+                         'small/z.jpg')
+
+    def test_symlinked_directories_are_skipped(self):
+        self.touch('other', 'image.jpg')
+        os.makedirs(os.path.join(self.root, 'album'))
+        os.symlink(os.path.join(self.root, 'other'),
+                   os.path.join(self.root, 'album', 'link'))
+        album = os.path.join(self.root, 'album')
+        self.assertEqual(utils.find_thumb(album, '/site/small', '/site'), '')
+
+    def test_empty_or_missing_album(self):
+        os.makedirs(os.path.join(self.root, 'empty'))
+        self.touch('text', 'notes.txt')
+        for album in ['empty', 'text', 'missing']:
+            album = os.path.join(self.root, album)
+            self.assertEqual(utils.find_thumb(album, '/site/small', '/site'),
+                             '', album)
+
+    def test_filter_image_matches_splitext(self):
+        for name in ['a.jpg', 'a.JPEG', '.a.png', 'a..webp', 'a.tiff.txt',
+                     '.png', '..jpg', '.', '', 'png', 'a.png.', 'a.gif']:
+            _, ext = os.path.splitext(name)
+            expected = ext.lower() in ['.jpeg', '.jpg', '.png', '.tiff', '.webp']
+            self.assertEqual(utils.filter_image(name), expected, name)
+
+    def test_dotfiles_are_not_images(self):
+        self.make_tree()
+        album = os.path.join(self.root, 'hidden')
+        self.assertEqual(utils.find_thumb(album, '/site/small', '/site'),
+                         'small/sub/.a.webp')
+
+    def test_find_thumbs_bulk(self):
+        self.make_tree()
+        albums = [(os.path.join(self.root, path), f'/site/{path}')
+                  for path in ['a', 'c', 'c/d', 'empty', 'missing']]
+        expected = {album: utils.find_thumb(album, image_root, '/site')
+                    for album, image_root in albums}
+        self.assertEqual(utils.find_thumbs_bulk(albums, '/site'), expected)
+        self.assertEqual(utils.find_thumbs_bulk(albums[:1], '/site'),
+                         {albums[0][0]: 'a/b/deep.jpg'})
+        self.assertEqual(utils.find_thumbs_bulk([], '/site'), {})
+
+
+class StartHttpdTest(unittest.TestCase):
+
+    def start(self, port, busy, args_port=None):
+        attempts = []
+
+        def server(address, handler):
+            attempts.append(address[1])
+            if address[1] in busy:
+                raise OSError(errno.EADDRINUSE, 'Address already in use')
+            return address
+
+        args = argparse.Namespace(port=args_port)
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                address = utils.start_httpd(server, ('', port), None, args)
+            except SystemExit:
+                address = None
+        return address, attempts
+
+    def test_next_available_port(self):
+        address, attempts = self.start(7499, busy={7499, 7500})
+        self.assertEqual(address, ('', 7501))
+        self.assertEqual(attempts, [7499, 7500, 7501])
+
+    def test_port_range_ends_at_7501(self):
+        address, attempts = self.start(7499, busy=set(range(7499, 7600)))
+        self.assertIsNone(address)
+        self.assertEqual(attempts, [7499, 7500, 7501])
+
+    def test_explicit_port_is_tried_once(self):
+        address, attempts = self.start(8000, busy={8000}, args_port=8000)
+        self.assertIsNone(address)
+        self.assertEqual(attempts, [8000])
+
+    def test_other_errors_are_raised(self):
+        def server(address, handler):
+            raise OSError(errno.EACCES, 'Permission denied')
+
+        args = argparse.Namespace(port=None)
+        with self.assertRaises(PermissionError):
+            utils.start_httpd(server, ('', 80), None, args)
+
+
+class EnsureRedirectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.thumb_dir = os.path.join(self.tmpdir.name, 'site')
+        self.index = os.path.join(self.thumb_dir, 'index.html')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_index(self):
+        with open(self.index, 'rb') as f:
+            return f.read()
+
+    def test_creates_redirect(self):
+        utils._ensure_redirect(self.thumb_dir)
+        self.assertEqual(self.read_index(), utils._REDIRECT_HTML)
+        self.assertEqual(os.listdir(self.thumb_dir), ['index.html'])
+
+    def test_unchanged_file_is_not_rewritten(self):
+        utils._ensure_redirect(self.thumb_dir)
+        os.utime(self.index, ns=(0, 0))
+        inode = os.stat(self.index).st_ino
+        utils._ensure_redirect(self.thumb_dir)
+        self.assertEqual(os.stat(self.index).st_mtime_ns, 0)
+        self.assertEqual(os.stat(self.index).st_ino, inode)
+
+    def test_different_file_is_replaced(self):
+        os.makedirs(self.thumb_dir)
+        for contents in [b'', b'x' * len(utils._REDIRECT_HTML)]:
+            with open(self.index, 'wb') as f:
+                f.write(contents)
+            utils._ensure_redirect(self.thumb_dir)
+            self.assertEqual(self.read_index(), utils._REDIRECT_HTML)
+
+
+class ChunksTest(unittest.TestCase):
+
+    def test_chunks(self):
+        self.assertEqual(list(utils.chunks('abcde', 2)),
+                         [['a', 'b'], ['c', 'd'], ['e']])
+        self.assertEqual(list(utils.chunks([], 2)), [])
+
+    def test_generator_is_consumed_lazily(self):
+        consumed = []
+
+        def generate():
+            for i in range(5):
+                consumed.append(i)
+                yield i
+
+        it = utils.chunks(generate(), 2)
+        self.assertEqual(next(it), [0, 1])
+        self.assertEqual(consumed, [0, 1])
+        self.assertEqual(list(it), [[2, 3], [4]])
+
+
+class FixedWidthFormatterTest(unittest.TestCase):
+
+    def test_formatter_is_cached(self):
+        formatter = utils.fixed_width_formatter(width=80)
+        self.assertIs(utils.fixed_width_formatter(), formatter)
+        self.assertIs(utils.fixed_width_formatter(80), formatter)
+        self.assertIs(utils.fixed_width_formatter(width=80), formatter)
+        self.assertIsNot(utils.fixed_width_formatter(40), formatter)
+
+    def test_width(self):
+        parser = argparse.ArgumentParser(
+            prog='shis', formatter_class=utils.fixed_width_formatter(40))
+        parser.add_argument('--option', help='word ' * 20)
+        lines = parser.format_help().splitlines()
+        self.assertLessEqual(max(map(len, lines)), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()